@@ -1,13 +1,34 @@
+import ahocorasick
+from functools import lru_cache
 from googleapiclient.discovery import build
 
+@lru_cache(maxsize=1)
+def _svc():
+    # static_discovery skips fetching the Discovery document over HTTP;
+    # caching the client saves rebuilding it on every search
+    return build("factchecktools", "v1alpha1", static_discovery=True)
+
+def _automaton(terms) -> "ahocorasick.Automaton":
+    ac = ahocorasick.Automaton()
+    for t in terms:
+        ac.add_word(t, t)
+    ac.make_automaton()
+    return ac
+
+# One linear pass per rating instead of one substring scan per keyword
+_FAKE_AC = _automaton(["false", "fake", "pants on fire", "incorrect", "misleading"])
+_TRUE_AC = _automaton(["true", "correct", "mostly true", "accurate"])
+
+def _matches(ac, text: str) -> bool:
+    return next(ac.iter(text), None) is not None
+
 def fact_check_search(query: str, lang: str = "en") -> list:
     """
     Search Google Fact Check Tools for claims related to a given query.
     Returns a list of claim results (if any).
     """
     try:
-        svc = build("factchecktools", "v1alpha1", cache_discovery=False)
-        res = svc.claims().search(query=query, languageCode=lang).execute()
+        res = _svc().claims().search(query=query, languageCode=lang).execute()
         return res.get("claims", [])
     except Exception:
         return []
@@ -34,9 +55,9 @@ def summarize_claims(claims):
 
             summary.append(f"{publisher}: {rating} — {title} ({url})")
 
-            if any(x in rating for x in ["false", "fake", "pants on fire", "incorrect", "misleading"]):
+            if _matches(_FAKE_AC, rating):
                 verdict = "fake"
-            if any(x in rating for x in ["true", "correct", "mostly true", "accurate"]):
+            if _matches(_TRUE_AC, rating):
                 verdict = verdict or "true"
 
     verdict = verdict or "uncertain"
@@ -1,17 +1,24 @@
 # app/main.py
-from fastapi import FastAPI, Body
+import asyncio
+from fastapi import FastAPI, Body, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
 from .config import settings
-from .firebase import get_db
+from .firebase import get_db, init_firebase
 from .model import classify_text
 from .factcheck import fact_check_search, summarize_claims
 from .models import VerifyIn, VerifyOut, ReportIn
 from google.cloud import firestore as gcf
 
-app = FastAPI(title="VerifiAI Backend (Text-only + Explainable Insights)")
+# orjson serializes the nested features/insights payloads (datetimes
+# included) several times faster than the stdlib json default
+app = FastAPI(
+    title="VerifiAI Backend (Text-only + Explainable Insights)",
+    default_response_class=ORJSONResponse,
+)
 
 # --- Middleware ---
 app.add_middleware(
@@ -22,30 +29,58 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def _startup():
+    # initialize once per worker so requests never pay (or race) the
+    # Admin SDK setup; also fork-safe under gunicorn preload
+    init_firebase()
+
+
 # --- Helper Functions ---
-def save_article(db, meta: Dict[str, Any]) -> Optional[str]:
-    data = {
+def _dedup_take(items, limit: int, key=None, value=None) -> List[Any]:
+    """First `limit` unique items, preserving order.
+
+    `key` derives the dedup key (defaults to the item itself) and `value`
+    maps the item into the output; falsy items/keys are skipped.
+    """
+    seen = set()
+    out: List[Any] = []
+    for x in items:
+        k = key(x) if key else x
+        if not k or k in seen:
+            continue
+        seen.add(k)
+        out.append(value(x) if value else x)
+        if len(out) >= limit:
+            break
+    return out
+
+
+def build_save_batch(db, meta: Dict[str, Any], result: Dict[str, Any], explanation: List[str]):
+    """Stage the article + verification writes as one batched commit.
+
+    Document ids are pre-allocated so the response can return the article
+    id before the commit actually runs.
+    """
+    art_ref = db.collection("articles").document()
+    ver_ref = db.collection("verifications").document()
+    batch = db.batch()
+    batch.set(art_ref, {
         "title": meta.get("title"),
         "text": meta["text"],
         "url": None,
         "source": None,
         "created_at": datetime.utcnow(),
-    }
-    # get the DocumentReference (index 0), not the write time
-    doc_ref, _ = db.collection("articles").add(data)
-    return doc_ref.id
-
-
-def save_verification(db, article_id: Optional[str], result: Dict[str, Any], explanation: List[str]):
-    doc = {
-        "article_id": article_id,
+    })
+    batch.set(ver_ref, {
+        "article_id": art_ref.id,
         "score": result["score"],
         "label": result["label"],
         "confidence": result["confidence"],
         "explanation": explanation,
         "created_at": datetime.utcnow(),
-    }
-    db.collection("verifications").add(doc)
+    })
+    return art_ref.id, batch
 
 
 # --- Routes ---
@@ -57,7 +92,7 @@ def health():
 
 
 @app.post("/verify", response_model=VerifyOut)
-def verify(payload: VerifyIn = Body(...)):
+async def verify(background_tasks: BackgroundTasks, payload: VerifyIn = Body(...)):
     """
     Text-only verification with Explainable AI:
     - Uses Google Cloud NLP for credibility scoring
@@ -69,8 +104,19 @@ def verify(payload: VerifyIn = Body(...)):
     title = text[:120]
     lang = getattr(payload, "language", "en")
 
-    # Step 1: Run NLP model (returns features + insights)
-    result = classify_text(title + ". " + text, settings.MODEL_NAME, language_code=lang)
+    def _run_fact_check():
+        # best-effort; the discovery client is blocking, so run in a thread
+        try:
+            return summarize_claims(fact_check_search(title))
+        except Exception:
+            return None, []
+
+    # Steps 1 & 3 together: NLP model and Fact Check are independent I/O,
+    # so run them concurrently instead of back-to-back
+    result, (fc_verdict, fc_summary) = await asyncio.gather(
+        classify_text(title + ". " + text, settings.MODEL_NAME, language_code=lang),
+        asyncio.to_thread(_run_fact_check),
+    )
 
     # Step 2: Build explainable reasons (clean + deduped)
     explanation: List[str] = []
@@ -81,58 +127,25 @@ def verify(payload: VerifyIn = Body(...)):
     mag = float(f.get("sentiment_magnitude", 0.0))
     wiki_hits = int(f.get("entity_wiki_hits", 0))
 
-    # categories: take from features/insights, dedupe, keep 3, shorten nicely
+    # categories: dedupe, keep 3, shorten "/A/B/C" → "C"
     raw_cats = (i.get("categories") or f.get("categories") or [])
-    cats = []
-    seen_cat = set()
-    for c in raw_cats:
-        if not c:
-            continue
-        # shorten "/A/B/C" → "C"
-        short = c.split("/")[-1] if "/" in c else c
-        key = short.lower()
-        if key not in seen_cat:
-            seen_cat.add(key)
-            cats.append(short)
-        if len(cats) >= 3:
-            break
+    cats = _dedup_take((c.rsplit("/", 1)[-1] for c in raw_cats if c), 3, key=str.lower)
 
     # sensational terms: dedupe + keep 6
-    terms = list(dict.fromkeys((i.get("sensational_terms") or [])))
-    terms = terms[:6]
+    terms = _dedup_take(i.get("sensational_terms") or [], 6)
 
     # key entities: dedupe by lowercase name, mark wiki, keep 4
-    ke = i.get("key_entities") or []
-    names = []
-    seen = set()
-    for e in ke:
-        nm = (e or {}).get("name")
-        if not nm:
-            continue
-        k = nm.strip().lower()
-        if k in seen:
-            continue
-        seen.add(k)
-        if (e or {}).get("wikipedia_url"):
-            nm = f"{nm} (wiki)"
-        names.append(nm)
-        if len(names) >= 4:
-            break
+    names = _dedup_take(
+        (e for e in (i.get("key_entities") or []) if (e or {}).get("name")),
+        4,
+        key=lambda e: e["name"].strip().lower(),
+        value=lambda e: f"{e['name']} (wiki)" if e.get("wikipedia_url") else e["name"],
+    )
 
     # notables: dedupe, keep 1–2
-    notables = []
-    seen_lines = set()
-    for s in (i.get("notable_sentences") or []):
-        s = (s or "").strip()
-        if not s:
-            continue
-        k = s.lower()
-        if k in seen_lines:
-            continue
-        seen_lines.add(k)
-        notables.append(s)
-        if len(notables) >= 2:
-            break
+    notables = _dedup_take(
+        ((s or "").strip() for s in (i.get("notable_sentences") or [])), 2, key=str.lower
+    )
 
     # build explanation list (lenient but tidy)
     if pen > 0:
@@ -154,13 +167,6 @@ def verify(payload: VerifyIn = Body(...)):
     if not explanation:
         explanation.append("Computed from entity grounding, sentiment magnitude, and sensational-text heuristics.")
 
-    # Step 3: Fact Check (optional, best-effort)
-    try:
-        claims = fact_check_search(title)
-        fc_verdict, fc_summary = summarize_claims(claims)
-    except Exception:
-        fc_verdict, fc_summary = None, []
-
     # Step 4: Merge Fact Check verdict with model score
     if fc_verdict and fc_verdict in ["true", "fake"]:
         result["label"] = fc_verdict
@@ -174,12 +180,13 @@ def verify(payload: VerifyIn = Body(...)):
     if not explanation:
         explanation.append("Computed from entity grounding, sentiment magnitude, and sensational-text heuristics.")
 
-    # Step 5: Save safely to Firestore
+    # Step 5: Save safely to Firestore — one batched commit, run after the
+    # response so the two write RTTs aren't user-visible
     article_id: Optional[str] = None
     try:
         meta = {"title": text[:100], "text": text}
-        article_id = save_article(db, meta)
-        save_verification(db, article_id, result, explanation)
+        article_id, batch = build_save_batch(db, meta, result, explanation)
+        background_tasks.add_task(batch.commit)
     except Exception as e:
         explanation.append(f"(Note: DB save skipped: {e.__class__.__name__})")
 
@@ -223,17 +230,16 @@ def get_article(id: str):
     article = art_ref.to_dict()
     article["id"] = id
 
+    # needs the composite index (article_id ASC, created_at DESC) declared
+    # in firestore.indexes.json; limit keeps the response bounded
     vers = (
         db.collection("verifications")
         .where("article_id", "==", id)
         .order_by("created_at", direction=gcf.Query.DESCENDING)
+        .limit(50)
         .stream()
     )
-    vlist = []
-    for v in vers:
-        d = v.to_dict()
-        d["id"] = v.id
-        vlist.append(d)
+    vlist = [v.to_dict() | {"id": v.id} for v in vers]
 
     return {"article": article, "verifications": vlist}
 
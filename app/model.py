@@ -1,33 +1,202 @@
 # app/model.py
+import asyncio
+import hashlib
+import heapq
 from google.cloud import language_v2 as language
 import re
+from collections import OrderedDict
+from datetime import datetime, timedelta
 from functools import lru_cache
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-SENSATIONAL = set("""
+import ahocorasick
+import numpy as np
+from numba import njit
+from numba import types as nb_types
+
+SENSATIONAL = frozenset("""
 shocking unbelievable exposed scandal meltdown destroyed bombshell secretly banned miracle cure guaranteed instant
 """.split())
 
+# Multi-word phrases the old per-token set lookup could never match
+SENSATIONAL_PHRASES = (
+    "miracle cure",
+    "doctors hate",
+    "you won't believe",
+    "what happens next",
+    "the truth about",
+)
+
+_WS_RE = re.compile(r"\s+")
+
+_TERMINATORS = frozenset(".!?")
+
+# Results keyed by content hash so re-verifying the same article (common
+# when hot topics circulate) skips the billed NLP RPCs entirely.
+_CACHE_MAX = 1024
+_CACHE_TTL = timedelta(days=7)
+_RESULT_CACHE: "OrderedDict[str, dict]" = OrderedDict()
+
+# keep strong references so in-flight cache writes aren't garbage-collected
+_PENDING_CACHE_WRITES: set = set()
+
+
+def _cache_key(text: str) -> str:
+    normalized = _WS_RE.sub(" ", text.strip())[:20000]
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _cache_local(key: str, result: dict):
+    _RESULT_CACHE[key] = result
+    _RESULT_CACHE.move_to_end(key)
+    if len(_RESULT_CACHE) > _CACHE_MAX:
+        _RESULT_CACHE.popitem(last=False)
+
+
+async def _cache_get_remote(key: str) -> Optional[dict]:
+    """Best-effort read of the shared nlp_cache collection."""
+    try:
+        from .firebase import get_db
+        snap = await asyncio.to_thread(
+            lambda: get_db().collection("nlp_cache").document(key).get()
+        )
+        if snap.exists:
+            return snap.to_dict().get("result")
+    except Exception:
+        pass
+    return None
+
+
+async def _cache_put_remote(key: str, result: dict):
+    """Best-effort write; expires_at feeds the Firestore TTL policy."""
+    try:
+        from .firebase import get_db
+        doc = {"result": result, "expires_at": datetime.utcnow() + _CACHE_TTL}
+        await asyncio.to_thread(
+            lambda: get_db().collection("nlp_cache").document(key).set(doc)
+        )
+    except Exception:
+        pass
+
+
+def _automaton(terms) -> "ahocorasick.Automaton":
+    ac = ahocorasick.Automaton()
+    for t in terms:
+        ac.add_word(t, t)
+    ac.make_automaton()
+    return ac
+
+_SENSATIONAL_AC = _automaton(SENSATIONAL | set(SENSATIONAL_PHRASES))
+
+
+def _sensational_hits(lowered: str) -> List[str]:
+    """All sensational terms/phrases found in one linear pass.
+
+    The automaton matches substrings, so reject hits glued to letters
+    ("banned" inside "unbanned").
+    """
+    n = len(lowered)
+    hits = []
+    for end, term in _SENSATIONAL_AC.iter(lowered):
+        start = end - len(term) + 1
+        if start > 0 and lowered[start - 1].isalpha():
+            continue
+        if end + 1 < n and lowered[end + 1].isalpha():
+            continue
+        hits.append(term)
+    return hits
+
+
+# Explicit signatures force eager compilation at import time, so the first
+# request doesn't pay the JIT cost; cache=True persists the machine code.
+# The argument must be typed read-only: np.frombuffer over bytes yields a
+# readonly array, which a writable-array specialization would reject.
+_READONLY_U8 = nb_types.Array(nb_types.uint8, 1, "C", readonly=True)
+
+@njit(nb_types.UniTuple(nb_types.int64, 2)(_READONLY_U8), cache=True)
+def _flag_counts(buf):
+    """Count ASCII uppercase letters and '!' in one pass over the bytes."""
+    caps = 0
+    exclam = 0
+    for b in buf:
+        if 65 <= b <= 90:
+            caps += 1
+        elif b == 33:
+            exclam += 1
+    return caps, exclam
+
+
+def _sentence_bonuses(sentences: List[str]) -> List[float]:
+    """Per-sentence caps/exclamation bonuses, vectorized with numpy.
+
+    Sentences are packed into one byte buffer; cumulative sums of the
+    uppercase and '!' masks turn every per-sentence count into two index
+    lookups, so the whole article is scanned once regardless of the
+    number of sentences.
+    """
+    if not sentences:
+        return []
+    chunks = [s.encode("utf-8", "ignore") for s in sentences]
+    offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(c) for c in chunks])
+    buf = np.frombuffer(b"".join(chunks), dtype=np.uint8)
+
+    caps_cum = np.zeros(buf.size + 1, dtype=np.int64)
+    exclam_cum = np.zeros(buf.size + 1, dtype=np.int64)
+    caps_cum[1:] = np.cumsum((buf >= 65) & (buf <= 90))
+    exclam_cum[1:] = np.cumsum(buf == 33)
+
+    caps = caps_cum[offsets[1:]] - caps_cum[offsets[:-1]]
+    exclam = exclam_cum[offsets[1:]] - exclam_cum[offsets[:-1]]
+    lengths = np.maximum(1, offsets[1:] - offsets[:-1])
+
+    bonuses = 0.8 * (exclam >= 1) + 0.8 * (caps > 0.12 * lengths)
+    return bonuses.tolist()
+
 @lru_cache(maxsize=1)
 def _client():
     try:
-        return language.LanguageServiceClient()
+        return language.LanguageServiceAsyncClient()
     except Exception as e:
         print(f"Failed to create Google Cloud Language client: {str(e)}")
         return None
 
 def _split_sentences(text: str) -> List[str]:
-    return re.split(r'(?<=[.!?])\s+', text.strip())
-
-def _text_red_flags(text: str) -> float:
-    caps_ratio = sum(1 for c in text if c.isupper()) / max(1, len(text))
-    exclam = text.count("!")
-    sensational_hits = sum(1 for w in re.findall(r"[a-zA-Z]+", text.lower()) if w in SENSATIONAL)
-    penalty = 0.0
-    if caps_ratio > 0.12: penalty += 0.2
-    if exclam >= 3:      penalty += 0.15
-    penalty += min(0.25, sensational_hits * 0.05)
-    return min(0.6, penalty)
+    """Single-pass scanner replacing re.split(r'(?<=[.!?])\\s+', ...).
+
+    The lookbehind kept the regex engine off its fast path; one manual
+    pass emits the same splits: break after ./!/? followed by whitespace,
+    consuming the whitespace run.
+    """
+    text = text.strip()
+    n = len(text)
+    out = []
+    start = 0
+    i = 0
+    while i < n - 1:
+        if text[i] in _TERMINATORS and text[i + 1].isspace():
+            out.append(text[start:i + 1])
+            i += 2
+            while i < n and text[i].isspace():
+                i += 1
+            start = i
+        else:
+            i += 1
+    if start < n:
+        out.append(text[start:])
+    return out
+
+def _text_red_flags(text: str, hits: List[str] = None) -> float:
+    buf = np.frombuffer(text.encode("utf-8", "ignore"), dtype=np.uint8)
+    caps, exclam = _flag_counts(buf)
+    caps_ratio = caps / max(1, buf.size)
+    if hits is None:
+        hits = _sensational_hits(text.lower())
+    sensational_hits = len(hits)
+    # branchless: the comparisons contribute their weight directly
+    return min(0.6, 0.2 * (caps_ratio > 0.12)
+                    + 0.15 * (exclam >= 3)
+                    + min(0.25, sensational_hits * 0.05))
 
 def _entity_quality(entities) -> float:
     score = 0.0
@@ -37,48 +206,56 @@ def _entity_quality(entities) -> float:
             score += 0.03
     return min(0.3, score)
 
-def _analyze(text: str, language_code: str = "en"):
+async def _analyze(text: str, language_code: str = "en"):
     client = _client()
     if not client:
         # Return empty results if client creation failed
-        return None, [], []
+        return None, [], [], []
 
     doc = {"content": text[:20000], "type_": language.Document.Type.PLAIN_TEXT, "language_code": language_code}
+    plain_doc = {"content": text[:20000], "type_": language.Document.Type.PLAIN_TEXT}
     enc = language.EncodingType.UTF8
 
-    # sentiment with per-sentence magnitudes
+    # One annotate_text RPC computes sentiment + entities + categories
+    # together instead of three round-trips with the same document body
+    features = {
+        "extract_document_sentiment": True,
+        "extract_entities": True,
+        "classify_text": True,
+    }
+
     try:
-        sresp = client.analyze_sentiment(document=doc, encoding_type=enc)
+        resp = await client.annotate_text(document=doc, features=features, encoding_type=enc)
     except Exception as e:
-        print(f"Failed to analyze sentiment: {str(e)}")
+        print(f"Failed to annotate text: {str(e)}")
+        # retry with language auto-detection
         try:
-            auto_doc = {"content": text[:20000], "type_": language.Document.Type.PLAIN_TEXT}
-            sresp = client.analyze_sentiment(document=auto_doc, encoding_type=enc)
+            resp = await client.annotate_text(document=plain_doc, features=features, encoding_type=enc)
         except Exception as e:
-            print(f"Failed to analyze sentiment with auto-detection: {str(e)}")
-            return None, [], []
+            print(f"Failed to annotate text with auto-detection: {str(e)}")
+            # classification isn't supported for every language; retry
+            # without it so sentiment + entities survive rather than
+            # dropping all the way to the pure-heuristic fallback
+            no_classify = dict(features, classify_text=False)
+            try:
+                resp = await client.annotate_text(document=plain_doc, features=no_classify, encoding_type=enc)
+            except Exception as e:
+                print(f"Failed to annotate text without classification: {str(e)}")
+                return None, [], [], []
 
-    sentiment = sresp.document_sentiment
-    sentences = [(s.text.content, float(getattr(s.sentiment, "magnitude", 0.0))) for s in sresp.sentences]
-
-    # entities
-    ent_resp = client.analyze_entities(document={"content": text[:20000], "type_": language.Document.Type.PLAIN_TEXT},
-                                       encoding_type=enc)
-    entities = ent_resp.entities
-
-    # categories (best-effort)
-    try:
-        cat_resp = client.classify_text(document={"content": text[:20000], "type_": language.Document.Type.PLAIN_TEXT})
-        categories = cat_resp.categories
-    except Exception:
-        categories = []
+    sentiment = resp.document_sentiment
+    sentences = [(s.text.content, float(getattr(s.sentiment, "magnitude", 0.0))) for s in resp.sentences]
+    entities = resp.entities
+    # unsupported languages simply leave categories empty
+    categories = resp.categories
 
     return sentiment, sentences, entities, categories
 
-def _collect_insights(text: str, sentences, entities) -> Dict[str, Any]:
-    # top entities by salience
+def _collect_insights(text: str, sentences, entities, hits: List[str] = None) -> Dict[str, Any]:
+    # top entities by salience — nlargest keeps a heap of 8 instead of
+    # sorting every entity
     key_entities = []
-    for e in sorted(entities, key=lambda x: float(getattr(x, "salience", 0.0)), reverse=True)[:8]:
+    for e in heapq.nlargest(8, entities, key=lambda x: float(getattr(x, "salience", 0.0))):
         md = getattr(e, "metadata", {}) or {}
         key_entities.append({
             "name": getattr(e, "name", ""),
@@ -88,24 +265,20 @@ def _collect_insights(text: str, sentences, entities) -> Dict[str, Any]:
             "mid": md.get("mid"),
         })
 
-    # sensational words present
-    words = re.findall(r"[a-zA-Z]+", text.lower())
-    sensational_terms = sorted(list({w for w in words if w in SENSATIONAL}))[:10]
+    # sensational terms/phrases present
+    if hits is None:
+        hits = _sensational_hits(text.lower())
+    sensational_terms = sorted(set(hits))[:10]
 
     # notable sentences by magnitude + shouty heuristics
-    candidates = []
-    for s, mag in sentences:
-        caps_ratio = sum(1 for c in s if c.isupper()) / max(1, len(s))
-        exclam = s.count("!")
-        bonus = (0.8 if exclam >= 1 else 0.0) + (0.8 if caps_ratio > 0.12 else 0.0)
-        candidates.append((mag + bonus, s.strip()))
-    if not candidates:
-        for s in _split_sentences(text)[:8]:
-            caps_ratio = sum(1 for c in s if c.isupper()) / max(1, len(s))
-            exclam = s.count("!")
-            bonus = (0.8 if exclam >= 1 else 0.0) + (0.8 if caps_ratio > 0.12 else 0.0)
-            candidates.append((bonus, s.strip()))
-    notable_sentences = [s for _, s in sorted(candidates, key=lambda x: x[0], reverse=True)[:3] if s]
+    if sentences:
+        bonuses = _sentence_bonuses([s for s, _ in sentences])
+        candidates = [(mag + b, s.strip()) for (s, mag), b in zip(sentences, bonuses)]
+    else:
+        fallback = _split_sentences(text)[:8]
+        bonuses = _sentence_bonuses(fallback)
+        candidates = [(b, s.strip()) for s, b in zip(fallback, bonuses)]
+    notable_sentences = [s for _, s in heapq.nlargest(3, candidates, key=lambda x: x[0]) if s]
 
     return {
         "key_entities": key_entities,
@@ -113,11 +286,23 @@ def _collect_insights(text: str, sentences, entities) -> Dict[str, Any]:
         "notable_sentences": notable_sentences,
     }
 
-def classify_text(text: str, model_name: str = "gcp_nl", language_code: str = "en") -> dict:
-    result = _analyze(text, language_code=language_code)
+async def classify_text(text: str, model_name: str = "gcp_nl", language_code: str = "en") -> dict:
+    key = _cache_key(text)
+    cached = _RESULT_CACHE.get(key)
+    if cached is not None:
+        _RESULT_CACHE.move_to_end(key)
+        return dict(cached)
+
+    cached = await _cache_get_remote(key)
+    if cached is not None:
+        _cache_local(key, cached)
+        return dict(cached)
+
+    hits = _sensational_hits(text.lower())
+    result = await _analyze(text, language_code=language_code)
     if result is None or result[0] is None:
         # Fallback to basic heuristics if Google Cloud NLP fails
-        penalty = _text_red_flags(text)
+        penalty = _text_red_flags(text, hits)
         return {
             "label": "uncertain",
             "score": 50,
@@ -130,7 +315,7 @@ def classify_text(text: str, model_name: str = "gcp_nl", language_code: str = "e
             },
             "insights": {
                 "key_entities": [],
-                "sensational_terms": [w for w in re.findall(r"[a-zA-Z]+", text.lower()) if w in SENSATIONAL][:10],
+                "sensational_terms": sorted(set(hits))[:10],
                 "notable_sentences": _split_sentences(text)[:2]
             }
         }
@@ -148,7 +333,7 @@ def classify_text(text: str, model_name: str = "gcp_nl", language_code: str = "e
         mag = float(getattr(sentiment, "magnitude", 0.0))
         score -= min(20.0, mag * 3.0)
 
-    penalty = _text_red_flags(text)
+    penalty = _text_red_flags(text, hits)
     score -= penalty * 100
 
     score = max(0, min(100, round(score)))
@@ -161,7 +346,7 @@ def classify_text(text: str, model_name: str = "gcp_nl", language_code: str = "e
 
     confidence = round(abs(score - 50) / 50, 2)
 
-    insights = _collect_insights(text, sentences, entities)
+    insights = _collect_insights(text, sentences, entities, hits)
     features = {
         "entity_wiki_hits": min(
             25,
@@ -174,10 +359,18 @@ def classify_text(text: str, model_name: str = "gcp_nl", language_code: str = "e
         "categories": [getattr(c, "name", "") for c in (categories or [])][:5],
     }
 
-    return {
+    out = {
         "label": label,
         "score": score,
         "confidence": confidence,
         "features": features,
         "insights": insights,
     }
+    # Only successful analyses are cached; the heuristic fallback above
+    # shouldn't mask a recovered NLP client for a week. The Firestore
+    # write runs off the response path — no reason to await it here
+    _cache_local(key, out)
+    task = asyncio.create_task(_cache_put_remote(key, out))
+    _PENDING_CACHE_WRITES.add(task)
+    task.add_done_callback(_PENDING_CACHE_WRITES.discard)
+    return dict(out)
@@ -1,20 +1,53 @@
-import requests
+import asyncio
+import os
 
-API_KEY = "54bdf5db4b72433b9d65487144ae25f2"
+import aiohttp
 
-# ✅ insert the API_KEY properly inside the f-string
-url = f"https://newsapi.org/v2/top-headlines?language=en&pageSize=10&apiKey={API_KEY}"
+# ✅ key comes from the environment now instead of being hardcoded
+API_KEY = os.getenv("NEWSAPI_KEY", "")
 
-response = requests.get(url)
-data = response.json()
+CATEGORIES = ["general", "technology", "science", "health", "business"]
+
+
+def _url(category: str) -> str:
+    return (
+        "https://newsapi.org/v2/top-headlines"
+        f"?language=en&pageSize=10&category={category}&apiKey={API_KEY}"
+    )
+
+
+async def fetch(session: aiohttp.ClientSession, url: str) -> dict:
+    async with session.get(url) as resp:
+        return await resp.json()
+
+
+async def main():
+    if not API_KEY:
+        print("❌ Set NEWSAPI_KEY in the environment first")
+        return
+
+    # all category feeds fetched concurrently — total time is the slowest
+    # feed, not the sum of all of them
+    async with aiohttp.ClientSession() as session:
+        results = await asyncio.gather(
+            *(fetch(session, _url(c)) for c in CATEGORIES),
+            return_exceptions=True,
+        )
 
-if data.get("status") == "ok":
     print("\n🔥 Trending News Topics:\n")
-    for article in data["articles"]:
-        title = article.get("title")
-        link = article.get("url")
-        if title and link:
-            print(f"📰 {title}")
-            print(f"   👉 {link}\n")
-else:
-    print("❌ Error fetching news:", data)
+    seen = set()
+    for category, data in zip(CATEGORIES, results):
+        if isinstance(data, Exception) or data.get("status") != "ok":
+            print(f"❌ Error fetching {category} news:", data)
+            continue
+        for article in data["articles"]:
+            title = article.get("title")
+            link = article.get("url")
+            if title and link and link not in seen:
+                seen.add(link)
+                print(f"📰 {title}")
+                print(f"   👉 {link}\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
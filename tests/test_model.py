@@ -0,0 +1,27 @@
+import asyncio
+
+import numpy as np
+
+from app import model
+
+
+def test_flag_counts_accepts_readonly_frombuffer():
+    # np.frombuffer over bytes is read-only; the eager njit signature must
+    # accept it or every call site raises at dispatch
+    buf = np.frombuffer("SHOCKING!!! ok".encode("utf-8"), dtype=np.uint8)
+    caps, exclam = model._flag_counts(buf)
+    assert caps == 8
+    assert exclam == 3
+
+
+def test_classify_text_fallback_smoke(monkeypatch):
+    # No NLP client -> heuristic fallback; exercises _text_red_flags and
+    # the sensational automaton end to end
+    monkeypatch.setattr(model, "_client", lambda: None)
+    out = asyncio.run(
+        model.classify_text("SHOCKING!!! A miracle cure was EXPOSED. More text follows here.")
+    )
+    assert out["label"] == "uncertain"
+    assert out["features"]["sensational_penalty"] > 0
+    assert "shocking" in out["insights"]["sensational_terms"]
+    assert "miracle cure" in out["insights"]["sensational_terms"]